@@ -7,6 +7,8 @@ import json
 from decision_tree import DecisionTree
 from util import Observation
 import math
+import heapq
+import random
 
 class AdaBoost:
     """
@@ -26,7 +28,7 @@ class AdaBoost:
         :param observation: tuple to classify
         :return: estimated label
         """
-        if self is None:
+        if self.stumps is None:
             print("model not initialized")
             return None
         dutch_votes = 0
@@ -39,15 +41,25 @@ class AdaBoost:
                 dutch_votes += s.weight
         return "en" if english_votes >= dutch_votes else "nl"
 
-    def train(self, observations, h_count=25):
+    def train(self, observations, h_count=25, sample_rate=1.0, seed=None, check_every=5):
         """
         Set list of decision stumps to result of ada boost alg
         :param observations: all observations
         :param h_count: number of stumps to have - default is 25
+        :param sample_rate: fraction of observations each stump is fit on - 1 uses the full data every round
+        :param seed: random seed for sampling
+        :param check_every: max rounds between full data error checks when sampling
         """
         if len(observations) == 0:
             return
-        self.stumps = AdaBoost.learn_stumps(observations, h_count)
+        if sample_rate <= 0 or check_every < 1:
+            print("Sample rate and check interval must be positive")
+            return
+        if sample_rate < 1:
+            self.stumps = AdaBoost.learn_stumps_sampled(observations, h_count, sample_rate,
+                                                        check_every=check_every, seed=seed)
+        else:
+            self.stumps = AdaBoost.learn_stumps(observations, h_count)
 
     def from_json(self, json_text):
         """
@@ -114,3 +126,115 @@ class AdaBoost:
             stump.weight = math.log(((1 - error) / error), 2) / 2 if error != 0 else 10000
             hypotheses.append(stump)
         return hypotheses
+
+    @staticmethod
+    def draw_sample(observations, sample_rate, top_rate, rng, min_sample_size=100):
+        """
+        Draw a weighted sample - highest weight observations are all kept, the rest are sampled at random
+        * randomly sampled observations are scaled up so the sample's weight matches the full data
+        :param observations: all training examples
+        :param sample_rate: fraction of observations to put in the sample
+        :param top_rate: fraction of the sample taken from the highest weights
+        :param rng: random number generator
+        :param min_sample_size: smallest sample drawn, unless there are fewer observations
+        :return: list of weighted copies of the sampled observations
+        """
+        sample_size = min(len(observations), max(min_sample_size, int(len(observations) * sample_rate)))
+        top_count = int(sample_size * top_rate)
+        top = heapq.nlargest(top_count, range(len(observations)), key=lambda i: observations[i].weight)
+        top_set = set(top)
+        rest = [i for i in range(len(observations)) if i not in top_set]
+        rest_count = min(sample_size - top_count, len(rest))
+        sampled = rng.sample(rest, rest_count)
+        correction = len(rest) / rest_count if rest_count > 0 else 0
+        sample = []
+        for i in top:
+            o = observations[i]
+            copy = Observation(o.attributes, o.classification)
+            copy.weight = o.weight
+            sample.append(copy)
+        for i in sampled:
+            o = observations[i]
+            copy = Observation(o.attributes, o.classification)
+            copy.weight = o.weight * correction
+            sample.append(copy)
+        Observation.normalize_weights(sample)
+        return sample
+
+    @staticmethod
+    def check_full_error(observations, pending):
+        """
+        Full data error check - set each pending stump's weight from its error on all observations and bring
+        observation weights up to date, as learn_stumps would have
+        * observations with the same attributes and label are reweighted the same way, so stumps are only
+        evaluated once per group and observations are only touched to sum and scale weights
+        :param observations: all training examples
+        :param pending: stumps learned since the last check, in order
+        :return: number of pending stumps kept - stops after a stump with no full data error
+        """
+        group_weights = {}
+        for o in observations:
+            key = (tuple(o.attributes), o.classification)
+            group_weights[key] = group_weights.get(key, 0) + o.weight
+        groups = {key: Observation(key[0], key[1]) for key in group_weights}
+        multipliers = {key: 1 for key in group_weights}
+        for kept, stump in enumerate(pending):
+            correct = [key for key in groups if groups[key].classification == stump.predict(groups[key])]
+            total_weight = sum(group_weights.values())
+            error = (total_weight - sum(group_weights[key] for key in correct)) / total_weight
+            if error <= 0:
+                stump.weight = 10000
+                return kept + 1
+            delta_weight = error / (1 - error)
+            for key in correct:
+                group_weights[key] *= delta_weight
+                multipliers[key] *= delta_weight
+            stump.weight = math.log(((1 - error) / error), 2) / 2
+        for o in observations:
+            o.weight = o.weight * multipliers[(tuple(o.attributes), o.classification)]
+        Observation.normalize_weights(observations)
+        return len(pending)
+
+    @staticmethod
+    def learn_stumps_sampled(observations, hypothesis_count, sample_rate, top_rate=0.2, check_every=5, seed=None):
+        """
+        Learn stumps on weighted samples of the training examples
+        * each round fits and reweights only the sample, every check_every rounds (and after the last round or
+        a round with no sample error) a full data error check sets the stumps' weights and a new sample is drawn
+        :param observations: all training examples
+        :param hypothesis_count: number of hypotheses desired
+        :param sample_rate: fraction of observations each stump is fit on
+        :param top_rate: fraction of the sample taken from the highest weights
+        :param check_every: max rounds between full data error checks
+        :param seed: random seed for sampling
+        :return: list of weighted decision stumps learned - fewer than hypothesis_count if a stump is perfect
+        """
+        rng = random.Random(seed)
+        for o in observations:
+            o.weight = 1 / len(observations)
+        hypotheses = []
+        pending = []
+        sample = AdaBoost.draw_sample(observations, sample_rate, top_rate, rng)
+        for c in range(hypothesis_count):
+            error = 0
+            stump = DecisionTree()
+            stump.train(sample, 1)
+            for o in sample:
+                if o.classification != stump.predict(o):
+                    error += o.weight
+            pending.append(stump)
+            if error <= 0 or len(pending) == check_every or c == hypothesis_count - 1:
+                kept = AdaBoost.check_full_error(observations, pending)
+                hypotheses.extend(pending[:kept])
+                if hypotheses[-1].weight == 10000:
+                    return hypotheses
+                pending = []
+                if c < hypothesis_count - 1:
+                    sample = AdaBoost.draw_sample(observations, sample_rate, top_rate, rng)
+            else:
+                delta_weight = error / (1 - error)
+                for o in sample:
+                    if o.classification == stump.predict(o):
+                        o.weight = o.weight * delta_weight
+                Observation.normalize_weights(sample)
+        return hypotheses
@@ -7,6 +7,7 @@ import math
 import json
 from util import Node
 from util import Model
+from util import Observation
 
 class DecisionTree(Model):
     """
@@ -79,6 +80,116 @@ class DecisionTree(Model):
         self.root = \
             self.learn_decision_tree(examples, [x for x in range(len(examples[0].attributes))], examples, depth_limit)
 
+    def train_streaming(self, examples_path, depth_limit=-1, cached=False):
+        """
+        Learn DT breadth first, making one pass over the examples file per depth level
+        * only per frontier node class weights are kept in memory, never the examples themselves
+        :param examples_path: training examples file path or cached feature file path
+        :param depth_limit: max depths of tree
+        :param cached: True if examples_path is a cached feature file
+        """
+        root = Node(None)
+        # frontier node id -> [node, available attributes, parent class weights, depth]
+        frontier = {id(root): [root, None, None, 0]}
+        try:
+            while frontier:
+                counts = DecisionTree.frontier_class_weights(root, frontier, examples_path, cached)
+                if id(root) in frontier and len(counts) == 0:
+                    return
+                frontier = DecisionTree.split_frontier(frontier, counts, depth_limit)
+        except Exception as e:
+            print("Error: ", e, "\n could not train decision tree")
+            return
+        self.root = root
+
+    @staticmethod
+    def frontier_class_weights(root, frontier, examples_path, cached):
+        """
+        Route every example to its frontier node and sum class weights per node and attribute
+        :param root: root of partially built tree
+        :param frontier: frontier node id -> [node, available attributes, parent class weights, depth]
+        :param examples_path: training examples file path or cached feature file path
+        :param cached: True if examples_path is a cached feature file
+        :return: frontier node id -> [english weight, total weight, english weight per attribute, weight per attribute]
+        """
+        counts = {}
+        for o in Observation.iter_observations(examples_path, cached):
+            current = root
+            while len(current.children) != 0:
+                current = current.children[str(o.attributes[int(current.value)])]
+            entry = frontier.get(id(current))
+            if entry is None:
+                continue
+            if entry[1] is None:
+                entry[1] = [x for x in range(len(o.attributes))]
+            node_counts = counts.get(id(current))
+            if node_counts is None:
+                node_counts = [0, 0, [0] * len(o.attributes), [0] * len(o.attributes)]
+                counts[id(current)] = node_counts
+            node_counts[1] += o.weight
+            if o.classification == "en":
+                node_counts[0] += o.weight
+            for a in entry[1]:
+                if o.attributes[a] == 1:
+                    node_counts[3][a] += o.weight
+                    if o.classification == "en":
+                        node_counts[2][a] += o.weight
+        return counts
+
+    @staticmethod
+    def split_frontier(frontier, counts, depth_limit):
+        """
+        Turn every frontier node into a leaf or split it, same rules as learn_decision_tree
+        :param frontier: frontier node id -> [node, available attributes, parent class weights, depth]
+        :param counts: class weights per frontier node from frontier_class_weights
+        :param depth_limit: max depth allowed for tree
+        :return: next frontier
+        """
+        next_frontier = {}
+        for node_id, (node, attribute_list, parent_weights, depth) in frontier.items():
+            english_weight, total_weight, have_english, have_total = counts.get(node_id, [0, 0, None, None])
+            if parent_weights is None:
+                parent_weights = (english_weight, total_weight)
+            if depth == depth_limit:
+                node.value = "en" if english_weight >= total_weight / 2 else "nl"
+            elif total_weight == 0 or len(attribute_list) == 0:
+                node.value = "en" if parent_weights[0] >= parent_weights[1] / 2 else "nl"
+            elif english_weight == total_weight or english_weight == 0:
+                node.value = "en" if english_weight == total_weight else "nl"
+            else:
+                info_gain = {}
+                for a in attribute_list:
+                    info_gain[a] = DecisionTree.info_gain_from_weights(english_weight, total_weight,
+                                                                       have_english[a], have_total[a])
+                best_attribute = sorted(info_gain.items(), key=lambda v: v[1], reverse=True)[0][0]
+                node.value = str(best_attribute)
+                remaining = [a for a in attribute_list if a != best_attribute]
+                for has_attribute in ["1", "0"]:
+                    child = Node(None)
+                    node.add_child(has_attribute, child)
+                    next_frontier[id(child)] = [child, remaining.copy(), (english_weight, total_weight), depth + 1]
+        return next_frontier
+
+    @staticmethod
+    def info_gain_from_weights(english_weight, total_weight, have_english_weight, have_weight):
+        """
+        Calculate information gain of a split from class weights instead of examples
+        :param english_weight: english weight of node
+        :param total_weight: total weight of node
+        :param have_english_weight: english weight of examples having the attribute
+        :param have_weight: total weight of examples having the attribute
+        :return: info gain
+        """
+        remainder = 0
+        if have_weight > 0:
+            remainder += have_weight / total_weight * \
+                DecisionTree.binary_entropy(have_english_weight / have_weight)
+        not_have_weight = total_weight - have_weight
+        if not_have_weight > 0:
+            remainder += not_have_weight / total_weight * \
+                DecisionTree.binary_entropy((english_weight - have_english_weight) / not_have_weight)
+        return DecisionTree.binary_entropy(english_weight / total_weight) - remainder
+
     @staticmethod
     def get_english_count_weight(examples):
         """
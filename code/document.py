@@ -0,0 +1,105 @@
+"""
+Sliding window language classification over whole documents
+Author: Kilian Jakstis
+"""
+
+from collections import deque
+from util import Observation
+
+class DocumentClassifier:
+    """
+    Classifies a stream of words window by window
+    * feature counts are updated as words enter and leave the window instead of re-extracted per window
+    """
+
+    def __init__(self, model, window_size=15, step=None):
+        """
+        Initialize classifier
+        :param model: DT, ADA or prediction cache - anything with predict(observation)
+        :param window_size: number of words per window - default is 15, same as training examples
+        :param step: words the window moves between labels - defaults to window size
+        """
+        if window_size < 1 or (step is not None and step < 1):
+            raise ValueError("window size and step must be positive")
+        self.model = model
+        self.window_size = window_size
+        self.step = step if step is not None else window_size
+        self.label_counts = {"en": 0, "nl": 0}
+
+    @staticmethod
+    def iter_words(path, chunk_size=1 << 20):
+        """
+        Stream normalized words from a text file without loading it at once
+        :param path: document file path
+        :param chunk_size: characters read at a time
+        :return: generator of words
+        """
+        with open(path) as file:
+            partial = ""
+            chunk = file.read(chunk_size)
+            while chunk:
+                normalized = Observation.normalize_text(chunk)
+                words = (partial + normalized).split()
+                # last word may continue in the next chunk
+                partial = words.pop() if words and not normalized[-1].isspace() else ""
+                yield from words
+                chunk = file.read(chunk_size)
+            if partial:
+                yield partial
+
+    def window_label(self, counts):
+        """
+        Predict the label of a window from its summed word counts
+        :param counts: summed word counts of words in window
+        :return: estimated label, None if the model could not predict - not counted towards the document label
+        """
+        label = self.model.predict(Observation(Observation.features_from_counts(counts), None))
+        if label is not None:
+            self.label_counts[label] += 1
+        return label
+
+    def classify_windows(self, words):
+        """
+        Slide the window over the words, labeling it every step words, resetting any earlier window labels
+        * a document shorter than the window is labeled as a single window
+        :param words: iterable of normalized words
+        :return: generator of (index of first word in window, label)
+        """
+        self.label_counts = {"en": 0, "nl": 0}
+        window = deque()
+        counts = [0, 0, 0, 0, 0, 0]
+        position = 0
+        for w in words:
+            word_counts = Observation.word_counts(w)
+            window.append(word_counts)
+            for i, c in enumerate(word_counts):
+                counts[i] += c
+            if len(window) > self.window_size:
+                for i, c in enumerate(window.popleft()):
+                    counts[i] -= c
+            position += 1
+            if position >= self.window_size and (position - self.window_size) % self.step == 0:
+                yield position - self.window_size, self.window_label(counts)
+        if 0 < position < self.window_size:
+            yield 0, self.window_label(counts)
+
+    def document_label(self):
+        """
+        Aggregate window labels seen so far into a document label
+        :return: majority label and fraction of windows agreeing with it, None and 0 if no windows
+        """
+        total = self.label_counts["en"] + self.label_counts["nl"]
+        if total == 0:
+            return None, 0
+        label = "en" if self.label_counts["en"] >= self.label_counts["nl"] else "nl"
+        return label, self.label_counts[label] / total
+
+    def classify(self, words):
+        """
+        Classify a whole document
+        :param words: iterable of normalized words
+        :return: majority label and confidence
+        """
+        for _ in self.classify_windows(words):
+            pass
+        return self.document_label()
@@ -8,6 +8,8 @@ import argparse
 from util import Observation
 from decision_tree import DecisionTree
 from ada_boost import AdaBoost
+from prediction_cache import PredictionCache
+from document import DocumentClassifier
 
 def handle_args():
     """
@@ -21,12 +23,37 @@ def handle_args():
     parser_mode1.add_argument('hypothesis_out', help='filepath to save hypothesis object')
     parser_mode1.add_argument('learning_type',
                               help='dt - decision tree, ada - aba boost with decision stubs')
+    parser_mode1.add_argument('--sample-rate', type=float, default=1.0,
+                              help='ada only - fraction of examples each stump is fit on, 1 uses all examples')
+    parser_mode1.add_argument('--seed', type=int, default=None, help='ada only - random seed for sampling')
+    parser_mode1.add_argument('--check-every', type=int, default=5,
+                              help='ada only - max rounds between full data error checks when sampling')
+    parser_mode1.add_argument('--stream', action='store_true',
+                              help='dt only - train level by level streaming examples from disk')
+    parser_mode1.add_argument('--cached', action='store_true',
+                              help='dt only - examples file is a cached feature file, requires --stream')
     parser_mode1.set_defaults(func=train_routine)
     # predict model parser
     parser_mode2 = subparsers.add_parser('predict', help='predict model')
     parser_mode2.add_argument('hypothesis', help='file with hypothesis object')
     parser_mode2.add_argument('file', help='fill with observation to classify')
+    parser_mode2.add_argument('--cache-size', type=int, default=1024,
+                              help='max entries per prediction cache level, 0 disables caching')
     parser_mode2.set_defaults(func=predict_routine)
+    # classify document parser
+    parser_mode3 = subparsers.add_parser('document', help='classify whole document with sliding window')
+    parser_mode3.add_argument('hypothesis', help='file with hypothesis object')
+    parser_mode3.add_argument('file', help='document to classify')
+    parser_mode3.add_argument('--window', type=int, default=15, help='number of words per window')
+    parser_mode3.add_argument('--step', type=int, default=None,
+                              help='words the window moves between labels, defaults to window size')
+    parser_mode3.add_argument('--quiet', action='store_true', help='only print the document label')
+    parser_mode3.set_defaults(func=document_routine)
+    # feature cache parser
+    parser_mode4 = subparsers.add_parser('features', help='cache features of labeled examples for streaming')
+    parser_mode4.add_argument('examples', help='file with labeled examples')
+    parser_mode4.add_argument('features_out', help='filepath to save cached features')
+    parser_mode4.set_defaults(func=features_routine)
     # parse
     args = parser.parse_args()
     args.func(args)
@@ -35,30 +62,89 @@ def train_routine(args):
     """
     Run training routine
     * tree max depth / ada boost number of stumps is passed into model.train as second arg, otherwise uses defaults
-    :param args: example file path, model out path, DT/ADA mode
+    :param args: example file path, model out path, DT/ADA mode, ada sample rate, seed and check interval,
+    dt streaming flags
     """
     if os.path.isfile(args.examples):
         if args.learning_type != "dt" and args.learning_type != "ada":
             print("Learning type not recognized")
+        if args.cached and not args.stream:
+            print("Cached feature files can only be used with --stream")
+            return
+        if args.stream:
+            if args.learning_type != "dt":
+                print("Streaming training only supported for dt")
+                return
+            model = DecisionTree()
+            model.train_streaming(args.examples, cached=args.cached)
+            model.write_to_file(args.hypothesis_out)
+            return
+        if args.sample_rate <= 0 or args.check_every < 1:
+            print("Sample rate and check interval must be positive")
+            return
         observations = Observation.get_observations(args.examples, 1)
-        model = DecisionTree() if args.learning_type == "dt" else AdaBoost()
-        model.train(observations)
+        if args.learning_type == "dt":
+            model = DecisionTree()
+            model.train(observations)
+        else:
+            model = AdaBoost()
+            model.train(observations, sample_rate=args.sample_rate, seed=args.seed,
+                        check_every=args.check_every)
         model.write_to_file(args.hypothesis_out)
     else:
         print("Example data file not found.")
 
+def features_routine(args):
+    """
+    Run feature caching routine
+    :param args: example file path, cached features out path
+    """
+    if os.path.isfile(args.examples):
+        Observation.write_feature_file(args.examples, args.features_out)
+    else:
+        print("Example data file not found.")
+
 def predict_routine(args):
     """
     Run prediction routine
-    :param args: hypothesis file, prediction examples file path
+    :param args: hypothesis file, prediction examples file path, cache size
+    """
+    cache = PredictionCache(PredictionCache.model_from_file(args.hypothesis), args.cache_size)
+    texts = []
+    try:
+        with open(args.file) as file:
+            line = file.readline().strip()
+            while line:
+                texts.append(line.split("|")[-1])
+                line = file.readline().strip()
+    except Exception as e:
+        print("Error: ", e, "\n could not load examples")
+        return
+    for text in texts:
+        print(cache.predict_text(text))
+
+def document_routine(args):
+    """
+    Run document classification routine
+    :param args: hypothesis file, document file path, window size, step, quiet flag
     """
-    with open(args.hypothesis, 'r') as file:
-        data = file.read()
-    model = DecisionTree() if data[0] == "{" else AdaBoost()
-    model.from_json(data)
-    examples_to_classify = Observation.get_observations(args.file, 0)
-    for e in examples_to_classify:
-        print(model.predict(e))
+    if args.window < 1 or (args.step is not None and args.step < 1):
+        print("Window size and step must be positive")
+        return
+    cache = PredictionCache(PredictionCache.model_from_file(args.hypothesis))
+    classifier = DocumentClassifier(cache, args.window, args.step)
+    try:
+        for start, label in classifier.classify_windows(DocumentClassifier.iter_words(args.file)):
+            if label is None:
+                print("Model could not classify document")
+                return
+            if not args.quiet:
+                print(start, label)
+    except Exception as e:
+        print("Error: ", e, "\n could not read document")
+        return
+    label, confidence = classifier.document_label()
+    print(f"document: {label} {confidence}")
 
 if __name__ == '__main__':
     handle_args()
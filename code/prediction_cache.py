@@ -0,0 +1,170 @@
+"""
+Bounded LRU caching layer around model prediction
+Author: Kilian Jakstis
+"""
+
+import threading
+from collections import OrderedDict
+from util import Observation
+from decision_tree import DecisionTree
+from ada_boost import AdaBoost
+
+class LRUCache:
+    """
+    Bounded mapping that evicts the least recently used entry and counts hits and misses
+    * not thread safe on its own - PredictionCache guards it with a lock
+    """
+
+    def __init__(self, max_size):
+        """
+        Initialize empty cache
+        :param max_size: max number of entries kept, 0 disables caching
+        """
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        Look up a key and mark it as most recently used
+        :param key: cache key
+        :return: cached value or None on a miss
+        """
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """
+        Store a value, evicting the least recently used entry if full
+        :param key: cache key
+        :param value: value to store
+        """
+        if self.max_size <= 0:
+            return
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Drop all entries and reset statistics
+        """
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """
+        :return: dict of size, max size, hits and misses
+        """
+        return {"size": len(self.entries), "max_size": self.max_size, "hits": self.hits, "misses": self.misses}
+
+class PredictionCache:
+    """
+    Two level prediction cache for a DT or ADA model
+    * level 1 maps normalized text to its feature tuple, level 2 maps a feature tuple to a label
+    """
+
+    def __init__(self, model, max_size=1024):
+        """
+        Initialize cache around a trained model
+        :param model: DT or ADA model
+        :param max_size: max entries per level, 0 disables caching
+        """
+        self.model = model
+        self.lock = threading.Lock()
+        self.feature_cache = LRUCache(max_size)
+        self.prediction_cache = LRUCache(max_size)
+
+    @staticmethod
+    def model_from_file(model_path):
+        """
+        Load DT or ADA model from its json file
+        :param model_path: model file
+        :return: model object
+        """
+        with open(model_path, 'r') as file:
+            data = file.read()
+        model = DecisionTree() if data[0] == "{" else AdaBoost()
+        model.from_json(data)
+        return model
+
+    def load_model(self, model):
+        """
+        Swap in a new model and invalidate cached predictions
+        * feature tuples only depend on the text so level 1 is kept
+        :param model: DT or ADA model
+        """
+        with self.lock:
+            self.model = model
+            self.prediction_cache.clear()
+
+    def reload(self, model_path):
+        """
+        Reload the model from file and invalidate cached predictions
+        :param model_path: model file
+        """
+        self.load_model(PredictionCache.model_from_file(model_path))
+
+    def features(self, text):
+        """
+        Get feature tuple of raw text, using level 1 cache
+        :param text: raw string of text data
+        :return: binary tuple of features
+        """
+        normalized = Observation.normalize_text(text)
+        with self.lock:
+            features = self.feature_cache.get(normalized)
+        if features is None:
+            features = Observation.extract_features(normalized)
+            with self.lock:
+                self.feature_cache.put(normalized, features)
+        return features
+
+    def predict(self, observation):
+        """
+        Predict an observation, using level 2 cache
+        :param observation: observation object
+        :return: estimated label
+        """
+        key = tuple(observation.attributes)
+        with self.lock:
+            model = self.model
+            label = self.prediction_cache.get(key)
+        if label is None:
+            label = model.predict(observation)
+            with self.lock:
+                # model may have been reloaded while predicting
+                if model is self.model:
+                    self.prediction_cache.put(key, label)
+        return label
+
+    def predict_text(self, text):
+        """
+        Predict label of raw text, going through both cache levels
+        :param text: raw string of text data
+        :return: estimated label
+        """
+        return self.predict(Observation(self.features(text), None))
+
+    def clear(self):
+        """
+        Drop both levels and reset statistics
+        """
+        with self.lock:
+            self.feature_cache.clear()
+            self.prediction_cache.clear()
+
+    def stats(self):
+        """
+        :return: dict of statistics per cache level
+        """
+        with self.lock:
+            return {"features": self.feature_cache.stats(), "predictions": self.prediction_cache.stats()}
@@ -55,45 +55,68 @@ class Observation:
             o.weight /= magnitude
 
     @staticmethod
-    def extract_features(s):
+    def normalize_text(s):
         """
-        Derive binary attribute tuple from string
-        * 1 represents having the attribute (or Dutch articles), 1 indicates Dutch, 0 indicates English ideally
-        :param s: string of text data
+        Lowercase text and replace everything but letters and whitespace with spaces
+        :param s: raw string of text data
+        :return: normalized string
+        """
+        return re.sub(r'[^a-zA-Z\s]', ' ', s.lower())
+
+    @staticmethod
+    def word_counts(w):
+        """
+        Get the contribution of a single word to the feature counts
+        :param w: word without whitespace
+        :return: tuple of first letter, double vowel, suffix, j consonant, dutch article, english article counts
+        """
+        if len(w) == 0:
+            return 0, 0, 0, 0, 0, 0
+        first_letter = 1 if w[0] in ["k", "j", "z", "v", "g"] else 0
+        suffix = 1 if len(w) >= 2 and w[len(w) - 2:] in ["en", "ij", "ig"] else 0
+        double_vowel = 1 if "aa" in w or "uu" in w else 0
+        j_consonant = 0
+        if w.find("j") != -1:
+            if w.find("j") == len(w) - 1:
+                j_consonant = 1
+            else:
+                if w[w.find("j") + 1] not in ["a", "e", "i", "o", "u"]:
+                    j_consonant = 1
+        dutch_article = 1 if w in ["de", "het", "een"] else 0
+        english_article = 1 if w in ["a", "an", "the"] else 0
+        return first_letter, double_vowel, suffix, j_consonant, dutch_article, english_article
+
+    @staticmethod
+    def features_from_counts(counts):
+        """
+        Derive binary attribute tuple from summed word counts
+        :param counts: summed word_counts tuples of all words
         :return: the binary tuple of features
         """
         dutch_articles = ["de", "het", "een"]
         english_articles = ["a", "an", "the"]
-        first_letter, double_vowel, suffix, j_consonant, articles = 0, 0, 0, 0, 0
-        words = s.split(" ")
-        eng_article_count = 0
-        dutch_article_count = 0
-        suffix_count = 0
-        first_letter_count = 0
-        for w in words:
-            if len(w) > 0:
-                if w[0] in ["k", "j", "z", "v", "g"] and first_letter == 0:
-                    first_letter_count += 1
-                if len(w) >= 2 and suffix == 0:
-                    if (w[len(w) - 2:]) == "en" or (w[len(w) - 2:]) == "ij" or (w[len(w) - 2:]) == "ig":
-                        suffix_count += 1
-                if "aa" in w or "uu" in w and double_vowel == 0:
-                    double_vowel = 1
-                if w.find("j") != -1 and j_consonant == 0:
-                    if w.find("j") == len(w) - 1:
-                        j_consonant = 1
-                    else:
-                        if w[w.find("j") + 1] not in ["a", "e", "i", "o", "u"]:
-                            j_consonant = 1
-                if w in dutch_articles:
-                    dutch_article_count += 1
-                if w in english_articles:
-                    eng_article_count += 1
+        first_letter_count, double_vowel_count, suffix_count, j_consonant_count, _, _ = counts
+        double_vowel = 1 if double_vowel_count > 0 else 0
+        j_consonant = 1 if j_consonant_count > 0 else 0
         articles = 1 if dutch_articles >= english_articles else 0
         suffix = 1 if suffix_count >= 2 else 0
         first_letter = 1 if first_letter_count >= 3 else 0
         return first_letter, double_vowel, suffix, j_consonant, articles
 
+    @staticmethod
+    def extract_features(s):
+        """
+        Derive binary attribute tuple from string
+        * 1 represents having the attribute (or Dutch articles), 1 indicates Dutch, 0 indicates English ideally
+        :param s: string of text data
+        :return: the binary tuple of features
+        """
+        counts = [0, 0, 0, 0, 0, 0]
+        for w in s.split(" "):
+            for i, c in enumerate(Observation.word_counts(w)):
+                counts[i] += c
+        return Observation.features_from_counts(counts)
+
     @staticmethod
     def get_observations(path, training):
         """
@@ -115,7 +138,7 @@ class Observation:
                         if data[0] != "nl" and data[0] != "en":
                             print("wrong label")
                             return None
-                        normalizer_string = re.sub(r'[^a-zA-Z\s]', ' ', data[1].lower())
+                        normalizer_string = Observation.normalize_text(data[1])
                         features = Observation.extract_features(normalizer_string)
                         observations.append(Observation(features, "en" if data[0] == "en" else "nl"))
                         line = file.readline()
@@ -125,7 +148,7 @@ class Observation:
                     line = file.readline().strip()
                     while line:
                         data = line.split("|")[-1]
-                        s = re.sub(r'[^a-zA-Z\s]', ' ', data.lower())
+                        s = Observation.normalize_text(data)
                         features = Observation.extract_features(s)
                         observations.append(Observation(features, None))
                         line = file.readline().strip()
@@ -134,6 +157,41 @@ class Observation:
             print("Error: ", e, "\n could not load examples")
             return []
 
+    @staticmethod
+    def iter_observations(path, cached=False):
+        """
+        Stream labeled observations from a data file one line at a time
+        :param path: training examples file path or cached feature file path
+        :param cached: True if path is a cached feature file written by write_feature_file
+        :return: generator of observation objects
+        """
+        with open(path) as file:
+            for line in file:
+                data = line.strip().split("|")
+                if len(data) != 2:
+                    raise ValueError("Issue with training file format")
+                if data[0] != "nl" and data[0] != "en":
+                    raise ValueError("wrong label")
+                if cached:
+                    features = tuple(int(c) for c in data[1])
+                else:
+                    features = Observation.extract_features(Observation.normalize_text(data[1]))
+                yield Observation(features, data[0])
+
+    @staticmethod
+    def write_feature_file(examples_path, feature_path):
+        """
+        Extract features of training examples once and cache them as label|bits lines
+        :param examples_path: training examples file path
+        :param feature_path: cached feature file to write
+        """
+        try:
+            with open(feature_path, "w") as file:
+                for o in Observation.iter_observations(examples_path):
+                    file.write(o.classification + "|" + "".join(str(a) for a in o.attributes) + "\n")
+        except Exception as e:
+            print("Error: ", e, "\n could not write feature file")
+
 class Node(dict):
     """
     Class representing a node of decision tree